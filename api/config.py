@@ -4,3 +4,36 @@ import os
 load_dotenv()
 
 RIOT_API_KEY = os.getenv("RIOT_API_KEY")
+
+# Coordination backend shared by every worker process: "local" (per process) or "sqlite" (shared file)
+RIOT_COORDINATION_BACKEND = os.getenv("RIOT_COORDINATION_BACKEND", "local")
+RIOT_COORDINATION_PATH = os.getenv("RIOT_COORDINATION_PATH", "/tmp/league_predictor_riot.sqlite")
+
+# Parses Riot's "requests:seconds" pairs, the same format as the X-App-Rate-Limit response header
+def parse_rate_limits(text):
+    return [tuple(int(part) for part in limit.split(":")) for limit in (text or "").split(",") if limit.strip()]
+
+# Riot app rate limits per routing host, e.g. "20:1,100:120" for a dev key.
+# Unset means the client follows the X-App-Rate-Limit header Riot returns for the key in use.
+RIOT_RATE_LIMITS = parse_rate_limits(os.getenv("RIOT_RATE_LIMITS"))
+# Used for a host until Riot's header has been seen once by any worker, dev-key limits are the strictest Riot hands out
+RIOT_FALLBACK_RATE_LIMITS = parse_rate_limits(os.getenv("RIOT_FALLBACK_RATE_LIMITS", "20:1,100:120"))
+
+# Cache lifetimes in seconds, finished matches never change so they can live much longer
+MATCH_CACHE_TTL = int(os.getenv("MATCH_CACHE_TTL", 60 * 60 * 24))
+ACCOUNT_CACHE_TTL = int(os.getenv("ACCOUNT_CACHE_TTL", 60 * 60))
+# Entries kept per cache (per process for "local", per file for "sqlite"), a trimmed match is roughly 20 KB
+RIOT_CACHE_MAX_ENTRIES = int(os.getenv("RIOT_CACHE_MAX_ENTRIES", 256))
+
+# Opt-in request profiling: fraction of requests to profile, or force one with the X-Profile-Token header
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0))
+PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+
+# Connection pool per routing host, hosts listed here are connected at startup and kept warm
+RIOT_WARM_HOSTS = [host.strip() for host in os.getenv("RIOT_WARM_HOSTS", "americas,na1").split(",") if host.strip()]
+RIOT_MAX_CONNECTIONS = int(os.getenv("RIOT_MAX_CONNECTIONS", 20))
+RIOT_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("RIOT_MAX_KEEPALIVE_CONNECTIONS", 10))
+RIOT_KEEPALIVE_EXPIRY = float(os.getenv("RIOT_KEEPALIVE_EXPIRY", 120))
+# Seconds between keep-warm pings, must stay below the keep-alive expiry
+RIOT_KEEPALIVE_INTERVAL = float(os.getenv("RIOT_KEEPALIVE_INTERVAL", 60))
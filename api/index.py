@@ -1,24 +1,56 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from riot.client import RiotClient
 from fastapi.middleware.cors import CORSMiddleware
-from schemas import LiveGameResponse
+from contextlib import asynccontextmanager
+from schemas import LiveGameResponse, BatchPlayersRequest
+from timing import RequestTimer, current_timer, span, timed, start_profile, stop_profile
+from typing import Optional
 import pandas as pd
 import itertools
 import asyncio
 import joblib
+import httpx
 import json
 import os
 
-app = FastAPI(title="League Predictor API")
+# Warm the Riot connection pools before serving and close them on shutdown
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await riot.start()
+    yield
+    await riot.aclose()
+
+app = FastAPI(title="League Predictor API", lifespan=lifespan)
+
+ALLOWED_ORIGINS = ["https://league-predictor-frontend.onrender.com"]
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["https://league-predictor-frontend.onrender.com"], 
+    allow_origins=ALLOWED_ORIGINS, 
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# Collect stage timings for every request and return them as a Server-Timing header
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    timer = RequestTimer()
+    token = current_timer.set(timer)
+    profiler = start_profile(request)
+    try:
+        with timer.span("total"):
+            response = await call_next(request)
+    finally:
+        current_timer.reset(token)
+        if profiler is not None:
+            await stop_profile(profiler, request)
+    response.headers["Server-Timing"] = timer.header()
+    # Lets the frontend origin see the timings in browser devtools
+    response.headers["Timing-Allow-Origin"] = ", ".join(ALLOWED_ORIGINS)
+    return response
+
 riot = RiotClient()
 
 RANK_BASELINES = {}
@@ -70,13 +102,93 @@ async def live_game(name: str, tag: str, routing: str = "americas", platform: st
         "game": game
     }
 
+# Helper to flatten one Match-V5 payload into the history entry for a single player
+def build_history_entry(m_data, p_puuid):
+    # Find only the data for current player out of the 10 in that match
+    stats = next(p for p in m_data["info"]["participants"] if p["puuid"] == p_puuid)
+    # Calculate team total gold, damage, and kills 
+    team_id = stats["teamId"]
+    team_members = [p for p in m_data["info"]["participants"] if p["teamId"] == team_id]
+    total_team_gold = sum(p["goldEarned"] for p in team_members)
+    total_team_damage = sum(p["totalDamageDealtToChampions"] for p in team_members)
+    total_team_kills = sum(p["kills"] for p in team_members)
+
+    # Gold Share % 
+    gold_share = round((stats["goldEarned"] / max(1, total_team_gold)) * 100, 1)
+    
+    # Damage Share % 
+    dmg_share = round((stats["totalDamageDealtToChampions"] / max(1, total_team_damage)) * 100, 1)
+    
+    # Kill Participation %
+    kp = round(((stats["kills"] + stats["assists"]) / max(1, total_team_kills)) * 100, 1)
+    game_duration_mins = m_data["info"]["gameDuration"] / 60
+    cs_per_min = (stats["totalMinionsKilled"] + stats["neutralMinionsKilled"]) / max(1, game_duration_mins)
+
+    enemyChampId = -1
+    current_pos = stats.get("teamPosition")
+    if current_pos and current_pos != "" and current_pos != "NONE":
+        enemyLaner = next((p for p in m_data["info"]["participants"] if p["teamPosition"] == current_pos and p["teamId"] != team_id), None)
+        if enemyLaner:
+            enemyChampId = enemyLaner["championId"]
+
+    return {
+        "win": stats["win"],
+        "champion": stats["championName"],
+        "championId": stats["championId"],
+        "teamPosition": stats["teamPosition"],
+        "enemyLaner": enemyChampId,
+        "champLevel": stats["champLevel"],
+        "kills": stats["kills"],
+        "deaths": stats["deaths"],
+        "assists": stats["assists"],
+        "kill_participation": kp,
+        "gold_earned": stats["goldEarned"],
+        "gold_share": gold_share,
+        "cs_per_min": cs_per_min,
+        "dmg_share": dmg_share,
+        "turret_kills": stats["turretKills"],
+        "wards_placed": stats["wardsPlaced"],
+        "wards_killed": stats["wardsKilled"],
+        "total_damage_dealt_to_champions": stats["totalDamageDealtToChampions"],
+        "true_damage_dealt_to_champions": stats["trueDamageDealtToChampions"],
+        "total_time_cc_dealt": stats["totalTimeCCDealt"],
+        "kda": (stats["kills"] + stats["assists"]) / max(1, stats["deaths"]),
+        "items": [stats[f"item{i}"] for i in range(7)],
+        "spell1": stats["summoner1Id"],
+        "spell2": stats["summoner2Id"],
+        "primaryStyle": stats["perks"]["styles"][0]["style"],
+        "subStyle": stats["perks"]["styles"][1]["style"],
+        "keystoneId": stats["perks"]["styles"][0]["selections"][0]["perk"],
+        "challenges": stats.get("challenges", {}),
+        "timePlayed": stats["timePlayed"],
+        "game_duration": m_data["info"]["gameDuration"], 
+        "game_end_timestamp": m_data["info"]["gameEndTimestamp"]
+    }
+
+# Helper to fetch one page of match details and flatten them into history entries
+async def fetch_history_page(p_puuid, routing, m_ids):
+    # Send match detail requests at once for this player using the get_match semaphores gatekeeping under Riots rate limit 
+    match_details = await asyncio.gather(*[riot.get_match_summary(match_id=mid, routing=routing) for mid in m_ids])
+
+    player_history = []
+    # Process each match found in the details list
+    for m_data in match_details:
+        if m_data:
+            player_history.append(build_history_entry(m_data, p_puuid))
+    return player_history
+
 # Helper function for processing match history for a single player in the active game 
-async def get_player_stats(p_puuid, routing, platform, count, queue):
+# With a target_role the match IDs (max_matches, default count) come from one call and details are fetched lazily,
+# each page only as large as the number of role matches still missing, until role_count are found
+async def get_player_stats(p_puuid, routing, platform, count, queue, target_role=None, role_count=5, max_matches=None):
     if p_puuid is None:
         return None, [], {"tier": "UNRANKED", "rank": "", "lp": 0, "wins": 0, "losses": 0}
     try:
+        # At least one match is needed either way, and Match-V5 returns at most 100 IDs per call
+        role_count = max(1, role_count)
+        id_count = count if target_role is None else min(max(1, max_matches or count), 100)
         # Fetch a list of match IDs and league entries for the specific PUUID
-        m_ids_data = riot.get_match_ids_by_puuid(puuid=p_puuid, routing=routing, count=count, queue=queue)
+        m_ids_data = riot.get_match_ids_by_puuid(puuid=p_puuid, routing=routing, count=id_count, queue=queue)
         league_data = riot.get_league_entries(puuid=p_puuid, platform=platform)
         m_ids, league_data = await asyncio.gather(m_ids_data, league_data)
 
@@ -99,73 +211,19 @@ async def get_player_stats(p_puuid, routing, platform, count, queue):
         else:
             rank_info = {"tier": "UNRANKED", "rank": "", "lp": 0, "wins": 0, "losses": 0}
 
-        # Send match detail requests at once for this player using the get_match semaphores gatekeeping under Riots rate limit 
-        match_details = await asyncio.gather(*[riot.get_match(match_id=mid, routing=routing) for mid in m_ids])
-        
-        player_history = []
-        # Process each match found in the details list
-        for m_data in match_details:
-            if m_data:
-                # Find only the data for current player out of the 10 in that match
-                stats = next(p for p in m_data["info"]["participants"] if p["puuid"] == p_puuid)
-                # Calculate team total gold, damage, and kills 
-                team_id = stats["teamId"]
-                team_members = [p for p in m_data["info"]["participants"] if p["teamId"] == team_id]
-                total_team_gold = sum(p["goldEarned"] for p in team_members)
-                total_team_damage = sum(p["totalDamageDealtToChampions"] for p in team_members)
-                total_team_kills = sum(p["kills"] for p in team_members)
-
-                # Gold Share % 
-                gold_share = round((stats["goldEarned"] / max(1, total_team_gold)) * 100, 1)
-                
-                # Damage Share % 
-                dmg_share = round((stats["totalDamageDealtToChampions"] / max(1, total_team_damage)) * 100, 1)
-                
-                # Kill Participation %
-                kp = round(((stats["kills"] + stats["assists"]) / max(1, total_team_kills)) * 100, 1)
-                game_duration_mins = m_data["info"]["gameDuration"] / 60
-                cs_per_min = (stats["totalMinionsKilled"] + stats["neutralMinionsKilled"]) / max(1, game_duration_mins)
-
-                enemyChampId = -1
-                current_pos = stats.get("teamPosition")
-                if current_pos and current_pos != "" and current_pos != "NONE":
-                    enemyLaner = next((p for p in m_data["info"]["participants"] if p["teamPosition"] == current_pos and p["teamId"] != team_id), None)
-                    if enemyLaner:
-                        enemyChampId = enemyLaner["championId"]
-
-                player_history.append({
-                    "win": stats["win"],
-                    "champion": stats["championName"],
-                    "championId": stats["championId"],
-                    "teamPosition": stats["teamPosition"],
-                    "enemyLaner": enemyChampId,
-                    "champLevel": stats["champLevel"],
-                    "kills": stats["kills"],
-                    "deaths": stats["deaths"],
-                    "assists": stats["assists"],
-                    "kill_participation": kp,
-                    "gold_earned": stats["goldEarned"],
-                    "gold_share": gold_share,
-                    "cs_per_min": cs_per_min,
-                    "dmg_share": dmg_share,
-                    "turret_kills": stats["turretKills"],
-                    "wards_placed": stats["wardsPlaced"],
-                    "wards_killed": stats["wardsKilled"],
-                    "total_damage_dealt_to_champions": stats["totalDamageDealtToChampions"],
-                    "true_damage_dealt_to_champions": stats["trueDamageDealtToChampions"],
-                    "total_time_cc_dealt": stats["totalTimeCCDealt"],
-                    "kda": (stats["kills"] + stats["assists"]) / max(1, stats["deaths"]),
-                    "items": [stats[f"item{i}"] for i in range(7)],
-                    "spell1": stats["summoner1Id"],
-                    "spell2": stats["summoner2Id"],
-                    "primaryStyle": stats["perks"]["styles"][0]["style"],
-                    "subStyle": stats["perks"]["styles"][1]["style"],
-                    "keystoneId": stats["perks"]["styles"][0]["selections"][0]["perk"],
-                    "challenges": stats.get("challenges", {}),
-                    "timePlayed": stats["timePlayed"],
-                    "game_duration": m_data["info"]["gameDuration"], 
-                    "game_end_timestamp": m_data["info"]["gameEndTimestamp"]
-                })    
+        if target_role is None:
+            player_history = await fetch_history_page(p_puuid, routing, m_ids)
+        else:
+            player_history = []
+            fetched = 0
+            missing = role_count
+            # Never costs more than the fixed path: one IDs call and at most id_count match calls
+            while missing > 0 and fetched < len(m_ids):
+                page = m_ids[fetched:fetched + missing]
+                player_history += await fetch_history_page(p_puuid, routing, page)
+                fetched += len(page)
+                missing = role_count - sum(1 for m in player_history if m["teamPosition"] == target_role)
+
         # Return a tuple so the main function can map history and rank to the correct PUUID
         return p_puuid, player_history, rank_info
     except Exception as e:
@@ -202,7 +260,7 @@ def calculate_player_average(history, target_role, rank_avgs):
     if len(role_matches) < 1:
         if rank_avgs:
             return rank_avgs, True
-        return None
+        return None, True
 
     averages = {}
     total_weight = 0
@@ -279,6 +337,59 @@ def sort_participants_by_lane(participants):
 
     return final_list + remaining[len(players):] if len(final_list) < 5 else final_list
 
+# Helper to attach lane probabilities and assign each participant a role, blue team first
+def assign_lanes(participants, lane_probs):
+    # Formatting to attach lane probabilities for the sorter
+    for p in participants:
+        champ_id_str = str(p["championId"])
+        p["laneProbabilities"] = lane_probs.get(champ_id_str, {"TOP": 0, "JNG": 0, "MID": 0, "BOT": 0, "SUP": 0})
+
+    # Split into teams and sort
+    blue_raw = [p for p in participants if p["teamId"] == 100]
+    red_raw = [p for p in participants if p["teamId"] == 200]
+    blue_sorted = sort_participants_by_lane(blue_raw)
+    red_sorted = sort_participants_by_lane(red_raw)
+
+    role_labels = ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"]
+    return [(p, role_labels[i]) for team in [blue_sorted, red_sorted] for i, p in enumerate(team)]
+
+# Helper to build the response participants with role averages from the fetched player data
+def format_participants(assigned, player_data_map):
+    formatted_participants = []
+    for p, this_role in assigned:
+        # Define PUUID for this specific iteration of the loop
+        p_puuid = p.get("puuid")
+        riot_id = p.get("riotId", "")
+        name_part, tag_part = riot_id.split("#") if ("#" in riot_id) else (riot_id or "Hidden Player", "Hidden")
+
+        p_data = player_data_map.get(p_puuid, {"history": [], "rank": {"tier": "UNRANKED", "rank": "", "lp": 0, "wins": 0, "losses": 0, "winrate": 0}})
+        # Load rank averages from hidden players
+        rank_avgs_role = RANK_BASELINES.get(this_role)
+        avg_stats, autofilled = calculate_player_average(p_data["history"], this_role, rank_avgs_role)
+        # print(f"DEBUG: Calculated averages for role {this_role} : {avg_stats}")
+
+        formatted_participants.append({
+            "puuid": p_puuid ,
+            "teamId": p["teamId"],
+            "championId": p["championId"],
+            "summonerName": name_part,
+            "tagLine": tag_part,
+            "assignedRole": this_role,
+            "bot": p.get("bot", False),
+            "spell1Id": p["spell1Id"],
+            "spell2Id": p["spell2Id"],
+            "perks": p.get("perks", {}),
+            "perkStyle": p.get("perks", {}).get("perkStyle"),
+            "perkSubStyle": p.get("perks", {}).get("perkSubStyle"),
+            "keystoneId": p.get("perks", {}).get("perkIds", [0])[0],
+            "history": p_data["history"], 
+            "rank": p_data["rank"],
+            "averages": avg_stats,
+            "autofilled": autofilled,
+            "laneProbabilities": p["laneProbabilities"]
+        })
+    return formatted_participants
+
 def load_prediction_model():
     global WIN_MODEL, WIN_MODEL_COLS,  WIN_SCALER  
     try:
@@ -295,10 +406,8 @@ def load_prediction_model():
     except Exception as e:
         print(f"ERROR loading model: {e}")
 
-def calculate_win_probability(participants):
-    if WIN_MODEL is None or WIN_MODEL_COLS is None:
-        return 0.5
-
+# Helper to turn role assigned participants into one model row of blue minus red role diffs
+def build_feature_row(participants):
     blue_team = {p["assignedRole"]: p["averages"] for p in participants if p["teamId"] == 100}
     red_team = {p["assignedRole"]: p["averages"] for p in participants if p["teamId"] == 200}
     roles_order = ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"]
@@ -307,45 +416,61 @@ def calculate_win_probability(participants):
     for role in roles_order:
         for feat in MODEL_FEATURES:
             col = f"diff_{role.lower()}_{feat}"
-            b_val = blue_team.get(role, {}).get(feat, 0)
-            r_val = red_team.get(role, {}).get(feat, 0)
+            b_val = (blue_team.get(role) or {}).get(feat, 0)
+            r_val = (red_team.get(role) or {}).get(feat, 0)
             row[col] = b_val - r_val
+    return row
+
+# Scores many games in one scaler and model call, one probability per row
+def predict_win_probabilities(rows):
+    if WIN_MODEL is None or WIN_MODEL_COLS is None:
+        return [0.5] * len(rows)
 
-    X = pd.DataFrame([row])
+    X = pd.DataFrame(rows)
     X = X.reindex(columns=WIN_MODEL_COLS, fill_value=0.0)
     X_scaled = WIN_SCALER.transform(X)
     try:
-        pred = WIN_MODEL.predict_proba(X_scaled)[0][1]
-        return float(round(pred, 4))
+        return [float(round(pred, 4)) for pred in WIN_MODEL.predict_proba(X_scaled)[:, 1]]
     except Exception as e:
         print(f"Prediction Error: {e}")
-        return 0.5
+        return [0.5] * len(rows)
+
+def calculate_win_probability(participants):
+    return predict_win_probabilities([build_feature_row(participants)])[0]
 
 # Load avg ranks immediately at startup
 load_rank_baselines()
 load_prediction_model()
 # @app.get("/api/live-game-history", response_model=LiveGameResponse)
 @app.get("/api/live-game-history")
-async def live_game_history(name: str, tag: str, routing: str = "americas", platform: str = "na1", count: int = 7, queue: int = 420):
+async def live_game_history(name: str, tag: str, routing: str = "americas", platform: str = "na1", count: int = 7, queue: int = 420, timings: bool = False,
+                            adaptive: bool = False, role_count: int = 5, max_matches: Optional[int] = None):
     global WIN_MODEL, RANK_BASELINES
     if WIN_MODEL is None:
         load_prediction_model()
     if not RANK_BASELINES:
         load_rank_baselines()
-    account = await riot.get_account_by_riot_id(name=name, tag=tag, routing=routing)
-    game = await riot.get_active_game_by_puuid(puuid=account["puuid"], platform=platform)
+    with span("account"):
+        account = await riot.get_account_by_riot_id(name=name, tag=tag, routing=routing)
+    with span("spectator"):
+        game = await riot.get_active_game_by_puuid(puuid=account["puuid"], platform=platform)
     
     if game is None:    
         return {"in_game": False}
 
     lane_probs = load_lanes_data()
 
+    # Roles only need spectator data and lanes.json, so assign them first and let adaptive lookups page towards them
+    with span("lanes"):
+        assigned = assign_lanes(game["participants"], lane_probs)
+
     tasks = []
-    for p in game["participants"]:
+    for p, this_role in assigned:
         # Returns None or an empty string for hidden players
         current_p_puuid = p.get("puuid")
         if current_p_puuid:
-            tasks.append(get_player_stats(current_p_puuid, routing, platform, count, queue))
+            target_role = this_role if adaptive else None
+            tasks.append(timed("player_stats", get_player_stats(current_p_puuid, routing, platform, count, queue, target_role, role_count, max_matches)))
     
     results = await asyncio.gather(*tasks)
 
@@ -355,64 +480,19 @@ async def live_game_history(name: str, tag: str, routing: str = "americas", plat
         if puuid:
             player_data_map[puuid] = {"history": hist, "rank": rank}
 
-    # Formatting to attach lane probabilities for the sorter
-    for p in game["participants"]:
-        champ_id_str = str(p["championId"])
-        p["laneProbabilities"] = lane_probs.get(champ_id_str, {"TOP": 0, "JNG": 0, "MID": 0, "BOT": 0, "SUP": 0})
-
-
-    # Split into teams and sort
-    blue_raw = [p for p in game["participants"] if p["teamId"] == 100]
-    red_raw = [p for p in game["participants"] if p["teamId"] == 200]
-    blue_sorted = sort_participants_by_lane(blue_raw)
-    red_sorted = sort_participants_by_lane(red_raw)
-
-    formatted_participants = []
-    role_labels = ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"]
-    for team in [blue_sorted, red_sorted]:
-        for i, p in enumerate(team):
-            # Define PUUID for this specific iteration of the loop
-            p_puuid = p.get("puuid")
-            riot_id = p.get("riotId", "")
-            name_part, tag_part = riot_id.split("#") if ("#" in riot_id) else (riot_id or "Hidden Player", "Hidden")
-
-            this_role = role_labels[i]
-            p_data = player_data_map.get(p_puuid, {"history": [], "rank": {"tier": "UNRANKED", "rank": "", "lp": 0, "wins": 0, "losses": 0, "winrate": 0}})
-            # Load rank averages from hidden players
-            rank_avgs_role = RANK_BASELINES.get(this_role)
-            avg_stats, autofilled = calculate_player_average(p_data["history"], this_role, rank_avgs_role)
-            # print(f"DEBUG: Calculated averages for role {this_role} : {avg_stats}")
-            
-            formatted_participants.append({
-                "puuid": p_puuid ,
-                "teamId": p["teamId"],
-                "championId": p["championId"],
-                "summonerName": name_part,
-                "tagLine": tag_part,
-                "assignedRole": this_role,
-                "bot": p.get("bot", False),
-                "spell1Id": p["spell1Id"],
-                "spell2Id": p["spell2Id"],
-                "perks": p.get("perks", {}),
-                "perkStyle": p.get("perks", {}).get("perkStyle"),
-                "perkSubStyle": p.get("perks", {}).get("perkSubStyle"),
-                "keystoneId": p.get("perks", {}).get("perkIds", [0])[0],
-                "history": p_data["history"], 
-                "rank": p_data["rank"],
-                "averages": avg_stats,
-                "autofilled": autofilled,
-                "laneProbabilities": p["laneProbabilities"]
-            })
+    with span("averages"):
+        formatted_participants = format_participants(assigned, player_data_map)
 
     for team_id in (100, 200):
         roles = [p["assignedRole"] for p in formatted_participants if p["teamId"] == team_id]
         if sorted(roles) != sorted(["TOP","JUNGLE","MIDDLE","BOTTOM","UTILITY"]):
             print("ROLE ASSIGNMENT BAD:", team_id, roles)
 
-    win_prob = calculate_win_probability(formatted_participants)
+    with span("inference"):
+        win_prob = calculate_win_probability(formatted_participants)
     print(win_prob)
 
-    return {
+    response = {
         "in_game": True,
         "prediction": win_prob,
         "game_id": game["gameId"],
@@ -423,6 +503,69 @@ async def live_game_history(name: str, tag: str, routing: str = "americas", plat
         "banned_champions": game.get("bannedChampions", []),
         "participants": formatted_participants 
     }
+    timer = current_timer.get()
+    if timings and timer is not None:
+        response["timings"] = dict(timer.spans)
+    return response
+
+@app.post("/api/players/batch")
+async def players_batch(body: BatchPlayersRequest):
+    if not RANK_BASELINES:
+        load_rank_baselines()
+
+    # Resolve every Riot ID at once, unknown players come back as 404s
+    with span("account"):
+        accounts = await asyncio.gather(
+            *[riot.get_account_by_riot_id(name=p.name, tag=p.tag, routing=body.routing) for p in body.players],
+            return_exceptions=True,
+        )
+
+    # Per player failures stay in that player's entry, only a rejected API key fails the whole lobby
+    errors = {}
+    for i, account in enumerate(accounts):
+        if account is None:
+            # Still rate limited after the client's retries
+            errors[i] = "rate_limited"
+        elif isinstance(account, httpx.HTTPStatusError):
+            status = account.response.status_code
+            if status in (401, 403):
+                raise account
+            errors[i] = "not_found" if status == 404 else f"riot_error_{status}"
+        elif isinstance(account, httpx.HTTPError):
+            errors[i] = "unavailable"
+        elif isinstance(account, Exception):
+            raise account
+
+    # One lookup per PUUID, matches shared between players are fetched once by the client
+    puuids = {account["puuid"] for i, account in enumerate(accounts) if i not in errors}
+    results = await asyncio.gather(*[timed("player_stats", get_player_stats(puuid, body.routing, body.platform, body.count, body.queue)) for puuid in puuids])
+    player_data_map = {puuid: {"history": hist, "rank": rank} for puuid, hist, rank in results}
+
+    players = []
+    with span("averages"):
+        for i, (query, account) in enumerate(zip(body.players, accounts)):
+            if i in errors:
+                players.append({"name": query.name, "tag": query.tag, "found": False, "error": errors[i]})
+                continue
+
+            p_data = player_data_map[account["puuid"]]
+            # Averages for every role the player has history in, the lobby has not locked roles yet
+            role_averages = {}
+            for role in ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"]:
+                if any(m["teamPosition"] == role for m in p_data["history"]):
+                    role_averages[role], _ = calculate_player_average(p_data["history"], role, None)
+
+            players.append({
+                "name": account.get("gameName", query.name),
+                "tag": account.get("tagLine", query.tag),
+                "found": True,
+                "puuid": account["puuid"],
+                "history": p_data["history"],
+                "rank": p_data["rank"],
+                "averages": role_averages,
+            })
+
+    return {"players": players}
 
 # Sequential requests 
 # @app.get("/api/live-game-history")
@@ -0,0 +1,160 @@
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROLES = ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"]
+
+# Offline replay of the live prediction pipeline over stored Match-V5 payloads.
+# Each game is rebuilt as it looked in champion select: players only get history from matches that ended before it started.
+# Usage from api/: python replay.py matches/ --workers 8
+
+# Per worker state, filled once by init_worker
+MATCHES = {}
+TIMELINES = {}
+HISTORY_CACHE = {}
+SETTINGS = {}
+
+
+# Reads a directory of match .json files or a .jsonl file with one payload per line
+def load_matches(path):
+    matches = []
+    if os.path.isdir(path):
+        for file_name in sorted(os.listdir(path)):
+            if file_name.endswith(".json"):
+                with open(os.path.join(path, file_name), "r", encoding="utf-8") as file:
+                    matches.append(json.load(file))
+    else:
+        with open(path, "r", encoding="utf-8") as file:
+            matches = [json.loads(line) for line in file if line.strip()]
+    return matches
+
+
+# Same filters the harvester applies so replayed games match the training data
+def is_scorable(match, queue):
+    info = match["info"]
+    if queue is not None and info.get("queueId") != queue:
+        return False
+    if info.get("gameMode") != "CLASSIC" or info["gameDuration"] / 60 < 15:
+        return False
+    return all(p.get("teamPosition") in ROLES for p in info["participants"])
+
+
+# Runs once per pool worker, importing index loads the model and baselines in that process
+def init_worker(matches, count, queue):
+    from index import load_lanes_data
+
+    # Every player's stored matches, most recent first like Match-V5 returns them
+    for match in matches:
+        info = match["info"]
+        MATCHES[match["metadata"]["matchId"]] = match
+        if queue is not None and info.get("queueId") != queue:
+            continue
+        for p in info["participants"]:
+            if p.get("puuid"):
+                TIMELINES.setdefault(p["puuid"], []).append((info["gameEndTimestamp"], match["metadata"]["matchId"]))
+    for timeline in TIMELINES.values():
+        timeline.sort(key=lambda item: item[0], reverse=True)
+
+    SETTINGS.update(count=count, lane_probs=load_lanes_data())
+
+
+def worker_ready(_):
+    return os.getpid()
+
+
+def rebuild_history(puuid, start_timestamp):
+    from index import build_history_entry
+
+    history = []
+    for end, match_id in TIMELINES.get(puuid, []):
+        if end >= start_timestamp:
+            continue
+        # A player's old match shows up in many later games, flatten it once per worker
+        key = (match_id, puuid)
+        if key not in HISTORY_CACHE:
+            HISTORY_CACHE[key] = build_history_entry(MATCHES[match_id], puuid)
+        history.append(HISTORY_CACHE[key])
+        if len(history) == SETTINGS["count"]:
+            break
+    return history
+
+
+def score_batch(match_ids):
+    from index import assign_lanes, format_participants, build_feature_row, predict_win_probabilities
+
+    rows = []
+    labels = []
+    for match_id in match_ids:
+        info = MATCHES[match_id]["info"]
+        participants = []
+        player_data_map = {}
+        for p in info["participants"]:
+            # Spectator-V5 shaped participant, the role is left for the lane sorter to work out
+            participants.append({
+                "puuid": p["puuid"],
+                "teamId": p["teamId"],
+                "championId": p["championId"],
+                "spell1Id": p["summoner1Id"],
+                "spell2Id": p["summoner2Id"],
+                "riotId": f"{p.get('riotIdGameName', '')}#{p.get('riotIdTagline', '')}",
+            })
+            history = rebuild_history(p["puuid"], info["gameStartTimestamp"])
+            player_data_map[p["puuid"]] = {"history": history, "rank": {"tier": "UNRANKED", "rank": "", "lp": 0, "wins": 0, "losses": 0}}
+
+        assigned = assign_lanes(participants, SETTINGS["lane_probs"])
+        rows.append(build_feature_row(format_participants(assigned, player_data_map)))
+        labels.append(int(any(p["win"] for p in info["participants"] if p["teamId"] == 100)))
+
+    # One scaler and model call for the whole batch
+    return list(zip(match_ids, predict_win_probabilities(rows), labels))
+
+
+def report(results, elapsed):
+    eps = 1e-15
+    total = len(results)
+    if total == 0:
+        print("No games scored.")
+        return
+    correct = sum(1 for _, prob, label in results if (prob >= 0.5) == bool(label))
+    log_loss = -sum(
+        label * math.log(min(max(prob, eps), 1 - eps)) + (1 - label) * math.log(1 - min(max(prob, eps), 1 - eps))
+        for _, prob, label in results
+    ) / total
+
+    print(f"Games scored : {total}")
+    print(f"Accuracy     : {correct / total:.4f}")
+    print(f"Log-loss     : {log_loss:.4f}")
+    print(f"Throughput   : {total / max(elapsed, 1e-9):.1f} games/s ({elapsed:.2f}s, history rebuild and inference)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay stored matches through the prediction pipeline.")
+    parser.add_argument("path", help="directory of match .json files or a .jsonl file")
+    parser.add_argument("--count", type=int, default=7, help="earlier matches per player, same as the live endpoint")
+    parser.add_argument("--queue", type=int, default=420, help="only replay and use history from this queue, -1 for any")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="process pool size")
+    parser.add_argument("--batch-size", type=int, default=64, help="games per worker task")
+    args = parser.parse_args()
+
+    queue = None if args.queue == -1 else args.queue
+    matches = load_matches(args.path)
+    match_ids = [m["metadata"]["matchId"] for m in matches if is_scorable(m, queue)]
+    print(f"Loaded {len(matches)} matches, replaying {len(match_ids)} games")
+
+    batches = [match_ids[i:i + args.batch_size] for i in range(0, len(match_ids), args.batch_size)]
+    results = []
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker, initargs=(matches, args.count, queue)) as pool:
+        # Start the workers and load the model before timing
+        list(pool.map(worker_ready, range(args.workers)))
+        start = time.perf_counter()
+        for batch_results in pool.map(score_batch, batches):
+            results.extend(batch_results)
+        elapsed = time.perf_counter() - start
+    report(results, elapsed)
+
+
+if __name__ == "__main__":
+    main()
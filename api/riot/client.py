@@ -1,28 +1,107 @@
 import httpx
 import asyncio
-from config import RIOT_API_KEY
+from urllib.parse import urlparse
+from config import parse_rate_limits, RIOT_API_KEY, RIOT_COORDINATION_BACKEND, RIOT_COORDINATION_PATH, RIOT_RATE_LIMITS, RIOT_FALLBACK_RATE_LIMITS, MATCH_CACHE_TTL, ACCOUNT_CACHE_TTL, RIOT_CACHE_MAX_ENTRIES
+from config import RIOT_WARM_HOSTS, RIOT_MAX_CONNECTIONS, RIOT_MAX_KEEPALIVE_CONNECTIONS, RIOT_KEEPALIVE_EXPIRY, RIOT_KEEPALIVE_INTERVAL
+from riot.coordination import create_backend
 
 class RiotClient:
-    def __init__(self):
+    def __init__(self, coordination=None):
         # Attach key as request header
         self.headers = {"X-Riot-Token": RIOT_API_KEY}
-        self.connection_limit = asyncio.Semaphore(10)
-        self.client = httpx.AsyncClient(headers=self.headers, timeout=30, http2=True)
+        # One HTTP/2 pool and concurrency limit per routing host so a busy region cannot starve the others
+        self.connection_limits = {}
+        self.limits = httpx.Limits(
+            max_connections=RIOT_MAX_CONNECTIONS,
+            max_keepalive_connections=RIOT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=RIOT_KEEPALIVE_EXPIRY,
+        )
+        self.clients = {}
+        self.keep_warm_task = None
+        # Match fetches in flight, so players who shared a game wait on one request instead of sending their own
+        self.inflight_matches = {}
+        # Limits Riot last reported per host, so they are only written to the backend when they change
+        self.rate_limits = {}
+        # Rate limit buckets and caches shared with the other worker processes
+        self.coordination = coordination or create_backend(
+            RIOT_COORDINATION_BACKEND, RIOT_COORDINATION_PATH, RIOT_FALLBACK_RATE_LIMITS, RIOT_CACHE_MAX_ENTRIES
+        )
+
+    def _client_for(self, host):
+        client = self.clients.get(host)
+        if client is None:
+            # The key is sent per request in _request, so warm-up pings go out without it
+            client = httpx.AsyncClient(timeout=30, http2=True, limits=self.limits)
+            self.clients[host] = client
+            # Same cap as the pool, so RIOT_MAX_CONNECTIONS is the one concurrency setting per host
+            self.connection_limits[host] = asyncio.Semaphore(RIOT_MAX_CONNECTIONS)
+        return client
+
+    async def warm(self, hosts=RIOT_WARM_HOSTS):
+        # Open DNS, TLS and HTTP/2 ahead of the first user request, the status of the response does not matter
+        async def ping(host):
+            url = f"https://{host}.api.riotgames.com/"
+            try:
+                await self._client_for(urlparse(url).hostname).head(url)
+            except Exception as e:
+                print(f"Warning: could not warm {host}: {e}")
+        await asyncio.gather(*[ping(host) for host in hosts])
+
+    async def _keep_warm(self, hosts):
+        while True:
+            await asyncio.sleep(RIOT_KEEPALIVE_INTERVAL)
+            # A failed round must not end the loop, the next one may succeed
+            try:
+                await self.warm(hosts)
+            except Exception as e:
+                print(f"ERROR: keep-warm round failed: {e}")
+
+    async def start(self, hosts=RIOT_WARM_HOSTS):
+        if RIOT_KEEPALIVE_INTERVAL >= RIOT_KEEPALIVE_EXPIRY:
+            raise ValueError(
+                f"RIOT_KEEPALIVE_INTERVAL ({RIOT_KEEPALIVE_INTERVAL}s) must be below RIOT_KEEPALIVE_EXPIRY ({RIOT_KEEPALIVE_EXPIRY}s) "
+                "or pooled connections expire between pings"
+            )
+        await self.warm(hosts)
+        self.keep_warm_task = asyncio.create_task(self._keep_warm(hosts))
+
+    async def aclose(self):
+        if self.keep_warm_task is not None:
+            self.keep_warm_task.cancel()
+            try:
+                await self.keep_warm_task
+            except asyncio.CancelledError:
+                pass
+            self.keep_warm_task = None
+        await asyncio.gather(*[client.aclose() for client in self.clients.values()])
+        self.clients = {}
+        self.connection_limits = {}
 
     async def _request(self, url, params=None):
-        # Semaphore to limit concurrent network connections
-        async with self.connection_limit:
-            for attempt in range(3):
+        # Riot enforces app limits per routing host, so each host gets its own bucket
+        bucket = urlparse(url).hostname
+        for attempt in range(3):
+            # Wait for a rate limit slot before taking a connection so a full bucket does not hold one up
+            # Without RIOT_RATE_LIMITS the backend applies the limits Riot reported to any worker
+            await self.coordination.acquire(bucket, RIOT_RATE_LIMITS or None)
+            client = self._client_for(bucket)
+            # Semaphore to limit concurrent network connections to this host
+            async with self.connection_limits[bucket]:
                 # Send GET request and package as json 
-                response = await self.client.get(url, headers=self.headers, params=params)
-                # if response.is_error:
-                #     print(f"DEBUG: Riot API Error {response.status_code} at {url}")
-                if response.status_code == 429:
-                    wait_time = int(response.headers.get("Retry-After", 2))
-                    await asyncio.sleep(wait_time)
-                    continue
-                response.raise_for_status()
-                return response.json()
+                response = await client.get(url, headers=self.headers, params=params)
+            # if response.is_error:
+            #     print(f"DEBUG: Riot API Error {response.status_code} at {url}")
+            app_limits = parse_rate_limits(response.headers.get("X-App-Rate-Limit"))
+            if app_limits and app_limits != self.rate_limits.get(bucket):
+                self.rate_limits[bucket] = app_limits
+                await self.coordination.set_limits(bucket, app_limits)
+            if response.status_code == 429:
+                wait_time = int(response.headers.get("Retry-After", 2))
+                # Hold back every worker on this host, not just this request
+                await self.coordination.block(bucket, wait_time)
+                continue
+            response.raise_for_status()
+            return response.json()
     
     async def get_league_entries_harvester(self, tier: str, division: str = "I", platform: str = "na1", page: int = 1):
         queue = "RANKED_SOLO_5x5"
@@ -33,7 +112,13 @@ class RiotClient:
     async def get_account_by_riot_id(self, name: str, tag: str, routing: str = "americas"):
         # Build Account-V1 endpoint URL by name tag 
         url = f"https://{routing}.api.riotgames.com/riot/account/v1/accounts/by-riot-id/{name}/{tag}"
-        return await self._request(url)
+        cache_key = f"account:{routing}:{name.lower()}#{tag.lower()}"
+        account = await self.coordination.cache_get(cache_key)
+        if account is None:
+            account = await self._request(url)
+            if account:
+                await self.coordination.cache_set(cache_key, account, ACCOUNT_CACHE_TTL)
+        return account
 
     async def get_active_game_by_puuid(self, puuid: str, platform: str = "na1"):
         # Build Spectator-V5 endpoint URL by puuid 
@@ -57,8 +142,51 @@ class RiotClient:
         return await self._request(url, params=params)
 
     async def get_match(self, match_id: str, routing: str = "americas"):
-        # Build Match-V5 endpoint URL by match_id 
-        url = f"https://{routing}.api.riotgames.com/lol/match/v5/matches/{match_id}"
-        return await self._request(url)
-            
-            
\ No newline at end of file
+        inflight_key = f"{routing}:{match_id}"
+        task = self.inflight_matches.get(inflight_key)
+        if task is None:
+            # Build Match-V5 endpoint URL by match_id 
+            url = f"https://{routing}.api.riotgames.com/lol/match/v5/matches/{match_id}"
+            task = asyncio.ensure_future(self._request(url))
+            self.inflight_matches[inflight_key] = task
+            task.add_done_callback(lambda _: self.inflight_matches.pop(inflight_key, None))
+        # Shield so one cancelled caller does not cancel the fetch for everyone else
+        return await asyncio.shield(task)
+
+    async def get_match_summary(self, match_id: str, routing: str = "americas"):
+        # Cached trimmed match for player histories, full payloads are too large to keep around
+        cache_key = f"match:{routing}:{match_id}"
+        summary = await self.coordination.cache_get(cache_key)
+        if summary is None:
+            match = await self.get_match(match_id=match_id, routing=routing)
+            if not match:
+                return match
+            summary = summarize_match(match)
+            await self.coordination.cache_set(cache_key, summary, MATCH_CACHE_TTL)
+        return summary
+
+
+# Participant fields read by build_history_entry in index.py, challenges are kept whole for the frontend
+SUMMARY_PARTICIPANT_FIELDS = [
+    "puuid", "teamId", "teamPosition", "win", "championName", "championId", "champLevel",
+    "kills", "deaths", "assists", "goldEarned", "totalMinionsKilled", "neutralMinionsKilled",
+    "turretKills", "wardsPlaced", "wardsKilled", "totalDamageDealtToChampions",
+    "trueDamageDealtToChampions", "totalTimeCCDealt", "summoner1Id", "summoner2Id", "timePlayed",
+    "challenges",
+] + [f"item{i}" for i in range(7)]
+SUMMARY_INFO_FIELDS = ["gameDuration", "gameStartTimestamp", "gameEndTimestamp", "gameMode", "queueId"]
+
+def summarize_match(match):
+    info = match["info"]
+    participants = []
+    for p in info["participants"]:
+        summary = {field: p[field] for field in SUMMARY_PARTICIPANT_FIELDS if field in p}
+        summary["perks"] = {"styles": [
+            {"style": style["style"], "selections": [{"perk": sel["perk"]} for sel in style["selections"]]}
+            for style in p["perks"]["styles"]
+        ]}
+        participants.append(summary)
+    return {
+        "metadata": {"matchId": match["metadata"]["matchId"]},
+        "info": {**{field: info[field] for field in SUMMARY_INFO_FIELDS if field in info}, "participants": participants},
+    }
@@ -0,0 +1,223 @@
+import asyncio
+import bisect
+import sqlite3
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import closing
+
+# Hits are kept at least this long, Riot's longest app window, so callers that know
+# different (or no) limits never prune history a stricter window still relies on
+HIT_RETENTION = 600
+
+
+# Shared state for RiotClient: rate limit buckets and a response cache.
+# Every worker process must use the same backend to stay under Riot's per key limits.
+class CoordinationBackend(ABC):
+    def __init__(self, fallback_limits=()):
+        self.fallback_limits = list(fallback_limits)
+
+    async def acquire(self, bucket, limits=None):
+        # Wait until a request slot is reserved in every (count, seconds) window of the bucket.
+        # limits=None uses the limits last stored with set_limits, or fallback_limits until then.
+        while True:
+            wait = await self._try_acquire(bucket, limits)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    # Reserve a slot and return 0, or return how many seconds to wait before trying again
+    @abstractmethod
+    async def _try_acquire(self, bucket, limits):
+        pass
+
+    # Share the limits Riot reported for a bucket with every other user of the backend
+    @abstractmethod
+    async def set_limits(self, bucket, limits):
+        pass
+
+    @abstractmethod
+    async def block(self, bucket, seconds):
+        pass
+
+    @abstractmethod
+    async def cache_get(self, key):
+        pass
+
+    @abstractmethod
+    async def cache_set(self, key, value, ttl):
+        pass
+
+
+# Single process backend, the default when running one uvicorn worker
+class LocalBackend(CoordinationBackend):
+    def __init__(self, fallback_limits=(), max_cache_entries=256):
+        super().__init__(fallback_limits)
+        self.hits = {}
+        self.learned_limits = {}
+        self.blocked_until = {}
+        self.cache = OrderedDict()
+        self.max_cache_entries = max_cache_entries
+        self.clock = time.monotonic
+
+    async def _try_acquire(self, bucket, limits):
+        now = self.clock()
+        if limits is None:
+            limits = self.learned_limits.get(bucket, self.fallback_limits)
+        # Sorted hit timestamps, the clock never goes backwards
+        hits = self.hits.setdefault(bucket, [])
+        longest = max([seconds for _, seconds in limits] + [HIT_RETENTION])
+        del hits[:bisect.bisect_right(hits, now - longest)]
+
+        wait = self.blocked_until.get(bucket, 0) - now
+        for count, seconds in limits:
+            in_window = len(hits) - bisect.bisect_right(hits, now - seconds)
+            if in_window >= count:
+                # A slot frees up once the count-th newest hit leaves the window
+                wait = max(wait, hits[len(hits) - count] + seconds - now)
+
+        # Every request is counted, even one made without limits
+        if wait <= 0:
+            hits.append(now)
+        return wait
+
+    async def set_limits(self, bucket, limits):
+        self.learned_limits[bucket] = list(limits)
+
+    async def block(self, bucket, seconds):
+        until = self.clock() + seconds
+        self.blocked_until[bucket] = max(self.blocked_until.get(bucket, 0), until)
+
+    async def cache_get(self, key):
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires <= self.clock():
+            del self.cache[key]
+            return None
+        self.cache.move_to_end(key)
+        return json.loads(value)
+
+    async def cache_set(self, key, value, ttl):
+        # Stored serialized, a JSON string is several times smaller than the parsed dicts and callers get their own copy
+        self.cache[key] = (json.dumps(value), self.clock() + ttl)
+        self.cache.move_to_end(key)
+        # Evict least recently used entries
+        while len(self.cache) > self.max_cache_entries:
+            self.cache.popitem(last=False)
+
+
+# SQLite file shared by every worker on the host, each operation runs in its own transaction
+class SQLiteBackend(CoordinationBackend):
+    def __init__(self, path, fallback_limits=(), max_cache_entries=256):
+        super().__init__(fallback_limits)
+        self.path = path
+        self.max_cache_entries = max_cache_entries
+        # Wall clock, monotonic clocks are not comparable between processes
+        self.clock = time.time
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS rate_hits (bucket TEXT NOT NULL, ts REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS rate_hits_bucket_ts ON rate_hits (bucket, ts)")
+            conn.execute("CREATE TABLE IF NOT EXISTS rate_limits (bucket TEXT PRIMARY KEY, limits TEXT NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS rate_blocks (bucket TEXT PRIMARY KEY, until REAL NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)")
+
+    def _connect(self):
+        # Autocommit mode so transactions are opened explicitly with BEGIN IMMEDIATE
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _try_acquire_sync(self, bucket, limits):
+        now = self.clock()
+        conn = self._connect()
+        try:
+            # Take the write lock up front so two workers cannot claim the same slot
+            conn.execute("BEGIN IMMEDIATE")
+            if limits is None:
+                row = conn.execute("SELECT limits FROM rate_limits WHERE bucket = ?", (bucket,)).fetchone()
+                limits = [tuple(limit) for limit in json.loads(row[0])] if row else self.fallback_limits
+            longest = max([seconds for _, seconds in limits] + [HIT_RETENTION])
+            conn.execute("DELETE FROM rate_hits WHERE bucket = ? AND ts <= ?", (bucket, now - longest))
+
+            row = conn.execute("SELECT until FROM rate_blocks WHERE bucket = ?", (bucket,)).fetchone()
+            wait = row[0] - now if row else 0
+            for count, seconds in limits:
+                # A slot frees up once the count-th newest hit leaves the window
+                row = conn.execute(
+                    "SELECT ts FROM rate_hits WHERE bucket = ? AND ts > ? ORDER BY ts DESC LIMIT 1 OFFSET ?",
+                    (bucket, now - seconds, count - 1),
+                ).fetchone()
+                if row:
+                    wait = max(wait, row[0] + seconds - now)
+
+            # Every request is counted, even one made without limits
+            if wait <= 0:
+                conn.execute("INSERT INTO rate_hits (bucket, ts) VALUES (?, ?)", (bucket, now))
+            conn.execute("COMMIT")
+            return wait
+        except Exception:
+            # BEGIN IMMEDIATE itself can fail with "database is locked", keep that error instead of a failed ROLLBACK
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _block_sync(self, bucket, seconds):
+        until = self.clock() + seconds
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO rate_blocks (bucket, until) VALUES (?, ?) "
+                "ON CONFLICT(bucket) DO UPDATE SET until = MAX(until, excluded.until)",
+                (bucket, until),
+            )
+
+    def _set_limits_sync(self, bucket, limits):
+        with closing(self._connect()) as conn:
+            conn.execute("INSERT OR REPLACE INTO rate_limits (bucket, limits) VALUES (?, ?)", (bucket, json.dumps(limits)))
+
+    def _cache_get_sync(self, key):
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT value FROM cache WHERE key = ? AND expires > ?", (key, self.clock())).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _cache_set_sync(self, key, value, ttl):
+        now = self.clock()
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM cache WHERE expires <= ?", (now,))
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                (key, json.dumps(value), now + ttl),
+            )
+            # Keep the table bounded, dropping the entries closest to expiry first
+            conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY expires DESC LIMIT -1 OFFSET ?)",
+                (self.max_cache_entries,),
+            )
+
+    # sqlite3 blocks, so keep it off the event loop
+    async def _try_acquire(self, bucket, limits):
+        return await asyncio.to_thread(self._try_acquire_sync, bucket, limits)
+
+    async def set_limits(self, bucket, limits):
+        await asyncio.to_thread(self._set_limits_sync, bucket, limits)
+
+    async def block(self, bucket, seconds):
+        await asyncio.to_thread(self._block_sync, bucket, seconds)
+
+    async def cache_get(self, key):
+        return await asyncio.to_thread(self._cache_get_sync, key)
+
+    async def cache_set(self, key, value, ttl):
+        await asyncio.to_thread(self._cache_set_sync, key, value, ttl)
+
+
+def create_backend(name, path=None, fallback_limits=(), max_cache_entries=256):
+    if name == "local":
+        return LocalBackend(fallback_limits, max_cache_entries)
+    if name == "sqlite":
+        return SQLiteBackend(path, fallback_limits, max_cache_entries)
+    raise ValueError(f"Unknown coordination backend: {name}")
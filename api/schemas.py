@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional, Any
 
 class MatchHistory(BaseModel):
@@ -32,4 +32,16 @@ class LiveGameResponse(BaseModel):
     game_start_time: Optional[int] = None
     game_length: Optional[int] = None
     banned_champions: List[dict] = []
-    participants: List[Participant] = []
\ No newline at end of file
+    participants: List[Participant] = []
+
+class RiotIdQuery(BaseModel):
+    name: str = Field(min_length=1)
+    tag: str = Field(min_length=1)
+
+class BatchPlayersRequest(BaseModel):
+    # A full champion select lobby, larger batches or histories would eat most of the Riot rate budget in one call
+    players: List[RiotIdQuery] = Field(min_length=1, max_length=5)
+    routing: str = "americas"
+    platform: str = "na1"
+    count: int = Field(7, ge=1, le=10)
+    queue: int = 420
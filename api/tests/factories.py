@@ -0,0 +1,66 @@
+# Minimal Match-V5 payloads with every field build_history_entry reads, plus some it does not
+
+
+def make_participant(puuid, team_id, position, win=True, **overrides):
+    participant = {
+        "puuid": puuid,
+        "teamId": team_id,
+        "teamPosition": position,
+        "win": win,
+        "championName": "Garen",
+        "championId": 86,
+        "champLevel": 15,
+        "kills": 5,
+        "deaths": 3,
+        "assists": 7,
+        "goldEarned": 11000,
+        "totalMinionsKilled": 180,
+        "neutralMinionsKilled": 8,
+        "turretKills": 1,
+        "wardsPlaced": 9,
+        "wardsKilled": 2,
+        "totalDamageDealtToChampions": 21000,
+        "trueDamageDealtToChampions": 3000,
+        "totalTimeCCDealt": 120,
+        "summoner1Id": 4,
+        "summoner2Id": 12,
+        "timePlayed": 1800,
+        "perks": {
+            "statPerks": {"defense": 5001, "flex": 5008, "offense": 5005},
+            "styles": [
+                {"description": "primaryStyle", "style": 8000, "selections": [{"perk": 8010, "var1": 1, "var2": 0, "var3": 0}]},
+                {"description": "subStyle", "style": 8400, "selections": [{"perk": 8444, "var1": 0, "var2": 0, "var3": 0}]},
+            ],
+        },
+        "challenges": {"kda": 4.0, "killParticipation": 0.6, "visionScorePerMinute": 0.8, "soloKills": 1},
+        "missions": {"playerScore0": 0},
+        "totalHeal": 4000,
+        "physicalDamageTaken": 15000,
+    }
+    participant.update({f"item{i}": 1000 + i for i in range(7)})
+    participant.update(overrides)
+    return participant
+
+
+ROLES = ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"]
+
+
+def make_match(match_id, puuid, position="TOP", game_end=1_700_000_000_000):
+    # puuid plays position on blue, everyone else is filler
+    participants = []
+    for team_id in (100, 200):
+        for role in ROLES:
+            player = puuid if team_id == 100 and role == position else f"{match_id}-{team_id}-{role}"
+            participants.append(make_participant(player, team_id, role, win=team_id == 100))
+    return {
+        "metadata": {"matchId": match_id, "participants": [p["puuid"] for p in participants]},
+        "info": {
+            "gameMode": "CLASSIC",
+            "queueId": 420,
+            "gameDuration": 1800,
+            "gameStartTimestamp": game_end - 1_800_000,
+            "gameEndTimestamp": game_end,
+            "teams": [{"teamId": 100, "objectives": {}}, {"teamId": 200, "objectives": {}}],
+            "participants": participants,
+        },
+    }
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+
+from riot.client import RiotClient, summarize_match
+from riot.coordination import LocalBackend
+from index import build_history_entry
+from factories import make_match
+
+
+def test_match_summary_builds_the_same_history_entry():
+    match = make_match("NA1_1", "me", position="MIDDLE")
+    summary = summarize_match(match)
+
+    assert build_history_entry(summary, "me") == build_history_entry(match, "me")
+    assert "missions" not in summary["info"]["participants"][0]
+    assert "teams" not in summary["info"]
+
+
+def test_concurrent_get_match_calls_share_one_request(monkeypatch):
+    client = RiotClient(coordination=LocalBackend())
+    calls = []
+
+    async def fake_request(url, params=None):
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        return make_match("NA1_1", "me")
+
+    monkeypatch.setattr(client, "_request", fake_request)
+
+    async def fetch_both():
+        return await asyncio.gather(client.get_match("NA1_1"), client.get_match("NA1_1"))
+
+    first, second = asyncio.run(fetch_both())
+    assert len(calls) == 1
+    assert first == second
+    assert client.inflight_matches == {}
+
+
+def test_match_summary_is_cached(monkeypatch):
+    client = RiotClient(coordination=LocalBackend())
+    calls = []
+
+    async def fake_request(url, params=None):
+        calls.append(url)
+        return make_match("NA1_1", "me")
+
+    monkeypatch.setattr(client, "_request", fake_request)
+
+    async def fetch_twice():
+        await asyncio.gather(client.get_match_summary("NA1_1"), client.get_match_summary("NA1_1"))
+        return await client.get_match_summary("NA1_1")
+
+    summary = asyncio.run(fetch_twice())
+    assert len(calls) == 1
+    assert summary == summarize_match(make_match("NA1_1", "me"))
@@ -0,0 +1,200 @@
+import asyncio
+import multiprocessing
+import sqlite3
+
+import pytest
+
+from riot.coordination import CoordinationBackend, LocalBackend, SQLiteBackend
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(params=["local", "sqlite"])
+def backend(request, tmp_path):
+    backend = LocalBackend() if request.param == "local" else SQLiteBackend(str(tmp_path / "coordination.sqlite"))
+    backend.clock = FakeClock()
+    return backend
+
+
+def try_acquire(backend, bucket, limits):
+    return asyncio.run(backend._try_acquire(bucket, limits))
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CoordinationBackend()
+
+
+def test_window_allows_count_then_waits_for_oldest_hit(backend):
+    limits = [(3, 10)]
+    for _ in range(3):
+        assert try_acquire(backend, "americas", limits) <= 0
+        backend.clock.now += 1
+
+    # Hits at 1000, 1001 and 1002, the first one leaves the window at 1010
+    assert try_acquire(backend, "americas", limits) == pytest.approx(7)
+    backend.clock.now = 1010
+    assert try_acquire(backend, "americas", limits) <= 0
+
+
+def test_every_window_must_have_room(backend):
+    limits = [(2, 1), (3, 60)]
+    assert try_acquire(backend, "americas", limits) <= 0
+    assert try_acquire(backend, "americas", limits) <= 0
+    assert try_acquire(backend, "americas", limits) == pytest.approx(1)
+
+    backend.clock.now += 1
+    assert try_acquire(backend, "americas", limits) <= 0
+    # The short window has room again but the long one is full until the first hit is 60s old
+    backend.clock.now += 1
+    assert try_acquire(backend, "americas", limits) == pytest.approx(58)
+
+
+def test_buckets_are_independent(backend):
+    assert try_acquire(backend, "americas", [(1, 10)]) <= 0
+    assert try_acquire(backend, "americas", [(1, 10)]) > 0
+    assert try_acquire(backend, "na1", [(1, 10)]) <= 0
+
+
+def test_no_limits_never_waits(backend):
+    for _ in range(100):
+        assert try_acquire(backend, "americas", []) <= 0
+
+
+def test_unlimited_acquire_keeps_the_window(backend):
+    limits = [(2, 60)]
+    assert try_acquire(backend, "americas", limits) <= 0
+    assert try_acquire(backend, "americas", limits) <= 0
+    assert try_acquire(backend, "americas", limits) > 0
+
+    # A caller without limits is let through but must not prune the window
+    backend.clock.now += 30
+    assert try_acquire(backend, "americas", []) <= 0
+    assert try_acquire(backend, "americas", limits) == pytest.approx(30)
+
+    # Its own hit at 1030 is counted, so only one more slot opens when the first two expire
+    backend.clock.now += 30
+    assert try_acquire(backend, "americas", limits) <= 0
+    assert try_acquire(backend, "americas", limits) == pytest.approx(30)
+
+
+def test_unlimited_acquire_from_another_sqlite_instance_keeps_the_window(tmp_path):
+    path = str(tmp_path / "coordination.sqlite")
+    first, second = SQLiteBackend(path), SQLiteBackend(path)
+    first.clock = second.clock = FakeClock()
+    assert first._try_acquire_sync("americas", [(2, 60)]) <= 0
+    assert first._try_acquire_sync("americas", [(2, 60)]) <= 0
+    assert first._try_acquire_sync("americas", [(2, 60)]) == pytest.approx(60)
+
+    assert second._try_acquire_sync("americas", []) <= 0
+    assert first._try_acquire_sync("americas", [(2, 60)]) == pytest.approx(60)
+
+
+def test_fallback_limits_apply_until_limits_are_learned(backend):
+    backend.fallback_limits = [(1, 10)]
+    assert try_acquire(backend, "americas", None) <= 0
+    assert try_acquire(backend, "americas", None) == pytest.approx(10)
+
+    asyncio.run(backend.set_limits("americas", [(5, 10)]))
+    assert try_acquire(backend, "americas", None) <= 0
+
+
+def test_learned_limits_are_shared_between_sqlite_instances(tmp_path):
+    path = str(tmp_path / "coordination.sqlite")
+    first, second = SQLiteBackend(path, fallback_limits=[(100, 1)]), SQLiteBackend(path, fallback_limits=[(100, 1)])
+    first.clock = second.clock = FakeClock()
+    asyncio.run(first.set_limits("americas", [(1, 10)]))
+
+    assert second._try_acquire_sync("americas", None) <= 0
+    assert second._try_acquire_sync("americas", None) == pytest.approx(10)
+
+
+def test_block_holds_bucket_until_expiry(backend):
+    asyncio.run(backend.block("americas", 5))
+    assert try_acquire(backend, "americas", []) == pytest.approx(5)
+    assert try_acquire(backend, "na1", []) <= 0
+    backend.clock.now += 5
+    assert try_acquire(backend, "americas", []) <= 0
+
+
+def test_cache_expires(backend):
+    asyncio.run(backend.cache_set("match:americas:NA1_1", {"info": {"gameId": 1}}, 60))
+    assert asyncio.run(backend.cache_get("match:americas:NA1_1")) == {"info": {"gameId": 1}}
+    assert asyncio.run(backend.cache_get("match:americas:NA1_2")) is None
+
+    backend.clock.now += 60
+    assert asyncio.run(backend.cache_get("match:americas:NA1_1")) is None
+
+
+def test_local_cache_evicts_least_recently_used():
+    backend = LocalBackend(max_cache_entries=2)
+    asyncio.run(backend.cache_set("a", 1, 60))
+    asyncio.run(backend.cache_set("b", 2, 60))
+    asyncio.run(backend.cache_get("a"))
+    asyncio.run(backend.cache_set("c", 3, 60))
+    assert asyncio.run(backend.cache_get("a")) == 1
+    assert asyncio.run(backend.cache_get("b")) is None
+
+
+def acquire_in_process(path, attempts, results):
+    backend = SQLiteBackend(path)
+    results.put(sum(1 for _ in range(attempts) if backend._try_acquire_sync("americas", [(5, 60)]) <= 0))
+
+
+def test_sqlite_budget_is_shared_across_processes(tmp_path):
+    path = str(tmp_path / "coordination.sqlite")
+    SQLiteBackend(path)
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=acquire_in_process, args=(path, 5, results)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=30)
+
+    assert sum(results.get(timeout=5) for _ in processes) == 5
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "coordination.sqlite")
+    asyncio.run(SQLiteBackend(path).cache_set("account:americas:a#b", {"puuid": "p"}, 60))
+    assert asyncio.run(SQLiteBackend(path).cache_get("account:americas:a#b")) == {"puuid": "p"}
+
+
+def test_sqlite_lock_timeout_keeps_the_original_error(tmp_path):
+    path = str(tmp_path / "coordination.sqlite")
+    backend = SQLiteBackend(path)
+    backend._connect = lambda: sqlite3.connect(path, timeout=0, isolation_level=None)
+
+    holder = sqlite3.connect(path, isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE")
+    try:
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            backend._try_acquire_sync("americas", [(1, 1)])
+    finally:
+        holder.execute("ROLLBACK")
+        holder.close()
+
+
+def test_sqlite_cache_is_bounded(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "coordination.sqlite"), max_cache_entries=2)
+    backend.clock = FakeClock()
+    for i, ttl in enumerate([30, 60, 90]):
+        asyncio.run(backend.cache_set(f"k{i}", i, ttl))
+
+    # The entry closest to expiry is dropped first
+    assert asyncio.run(backend.cache_get("k0")) is None
+    assert asyncio.run(backend.cache_get("k1")) == 1
+    assert asyncio.run(backend.cache_get("k2")) == 2
+
+
+def test_local_cache_returns_copies():
+    backend = LocalBackend()
+    asyncio.run(backend.cache_set("k", {"a": [1]}, 60))
+    asyncio.run(backend.cache_get("k"))["a"].append(2)
+    assert asyncio.run(backend.cache_get("k")) == {"a": [1]}
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+import index
+from factories import make_match
+
+
+class FakeRiot:
+    # Stands in for index.riot, serving a fixed history and counting Match-V5 calls
+    def __init__(self, positions, missing=()):
+        self.matches = {
+            f"NA1_{i}": None if i in missing else make_match(f"NA1_{i}", "me", position)
+            for i, position in enumerate(positions)
+        }
+        self.id_requests = []
+        self.match_calls = 0
+
+    async def get_match_ids_by_puuid(self, puuid, routing="americas", start=0, count=5, queue=None):
+        self.id_requests.append(count)
+        return list(self.matches)[start:start + count]
+
+    async def get_league_entries(self, puuid, platform="na1"):
+        return []
+
+    async def get_match_summary(self, match_id, routing="americas"):
+        self.match_calls += 1
+        return self.matches[match_id]
+
+
+def player_stats(monkeypatch, riot, **kwargs):
+    monkeypatch.setattr(index, "riot", riot)
+    return asyncio.run(index.get_player_stats("me", "americas", "na1", 7, 420, **kwargs))
+
+
+def test_fixed_path_fetches_count(monkeypatch):
+    riot = FakeRiot(["TOP"] * 10)
+    _, history, _ = player_stats(monkeypatch, riot)
+    assert riot.id_requests == [7]
+    assert riot.match_calls == 7
+    assert len(history) == 7
+
+
+def test_on_role_player_stops_at_role_count(monkeypatch):
+    riot = FakeRiot(["TOP"] * 10)
+    _, history, _ = player_stats(monkeypatch, riot, target_role="TOP", role_count=5)
+    assert riot.id_requests == [7]
+    assert riot.match_calls == 5
+    assert len(history) == 5
+
+
+def test_off_role_player_stops_at_the_cap(monkeypatch):
+    riot = FakeRiot(["MIDDLE"] * 20)
+    _, history, _ = player_stats(monkeypatch, riot, target_role="TOP", role_count=5, max_matches=12)
+    assert riot.id_requests == [12]
+    assert riot.match_calls == 12
+    assert all(m["teamPosition"] == "MIDDLE" for m in history)
+
+
+def test_defaults_never_cost_more_than_the_fixed_path(monkeypatch):
+    riot = FakeRiot(["TOP", "MIDDLE", "TOP", "MIDDLE", "TOP", "MIDDLE", "TOP", "TOP"])
+    player_stats(monkeypatch, riot, target_role="TOP")
+    assert riot.id_requests == [7]
+    assert riot.match_calls == 7
+
+
+def test_missing_payloads_do_not_count_towards_role_count(monkeypatch):
+    riot = FakeRiot(["TOP"] * 10, missing={0, 1})
+    _, history, _ = player_stats(monkeypatch, riot, target_role="TOP", role_count=5)
+    # First page of 5 has 3 usable matches, the second page asks for the 2 still missing
+    assert riot.match_calls == 7
+    assert len(history) == 5
+
+
+def test_non_positive_settings_are_clamped(monkeypatch):
+    riot = FakeRiot(["TOP"] * 10)
+    _, history, _ = player_stats(monkeypatch, riot, target_role="TOP", role_count=0, max_matches=-1)
+    assert riot.id_requests == [1]
+    assert riot.match_calls == 1
+    assert len(history) == 1
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+import httpx
+from fastapi.testclient import TestClient
+
+import index
+from schemas import BatchPlayersRequest
+from factories import make_match
+
+
+def status_error(status):
+    request = httpx.Request("GET", "https://americas.api.riotgames.com/riot/account/v1/accounts/by-riot-id/x/y")
+    return httpx.HTTPStatusError(f"{status}", request=request, response=httpx.Response(status, request=request))
+
+
+class FakeRiot:
+    # Stands in for index.riot, accounts maps "name#tag" to an account dict, None or an exception to raise
+    def __init__(self, accounts):
+        self.accounts = accounts
+        self.id_requests = []
+
+    async def get_account_by_riot_id(self, name, tag, routing="americas"):
+        account = self.accounts[f"{name}#{tag}"]
+        if isinstance(account, Exception):
+            raise account
+        return account
+
+    async def get_match_ids_by_puuid(self, puuid, routing="americas", start=0, count=5, queue=None):
+        self.id_requests.append(puuid)
+        return [f"NA1_{puuid}_{i}" for i in range(count)]
+
+    async def get_league_entries(self, puuid, platform="na1"):
+        return [{"queueType": "RANKED_SOLO_5x5", "tier": "GOLD", "rank": "II", "leaguePoints": 40, "wins": 6, "losses": 4}]
+
+    async def get_match_summary(self, match_id, routing="americas"):
+        puuid = match_id.split("_")[1]
+        return make_match(match_id, puuid, position="JUNGLE")
+
+
+def batch(monkeypatch, riot, players, **kwargs):
+    monkeypatch.setattr(index, "riot", riot)
+    body = BatchPlayersRequest(players=[{"name": name, "tag": tag} for name, tag in players], count=3, **kwargs)
+    return asyncio.run(index.players_batch(body))["players"]
+
+
+def test_found_player_gets_history_rank_and_role_averages(monkeypatch):
+    riot = FakeRiot({"Faker#KR1": {"puuid": "p1", "gameName": "Faker", "tagLine": "KR1"}})
+    [player] = batch(monkeypatch, riot, [("Faker", "KR1")])
+
+    assert player["found"] is True
+    assert player["puuid"] == "p1"
+    assert len(player["history"]) == 3
+    assert player["rank"]["tier"] == "GOLD"
+    assert list(player["averages"]) == ["JUNGLE"]
+
+
+def test_per_player_failures_do_not_fail_the_batch(monkeypatch):
+    riot = FakeRiot({
+        "Good#NA1": {"puuid": "p1", "gameName": "Good", "tagLine": "NA1"},
+        "Missing#NA1": status_error(404),
+        "Limited#NA1": None,
+        "Bad#NA1": status_error(400),
+        "Slow#NA1": httpx.ReadTimeout("timed out"),
+    })
+    players = batch(monkeypatch, riot, [("Good", "NA1"), ("Missing", "NA1"), ("Limited", "NA1"), ("Bad", "NA1"), ("Slow", "NA1")])
+
+    assert [p["found"] for p in players] == [True, False, False, False, False]
+    assert [p.get("error") for p in players] == [None, "not_found", "rate_limited", "riot_error_400", "unavailable"]
+    assert players[1]["name"] == "Missing"
+
+
+def test_rejected_api_key_fails_the_batch(monkeypatch):
+    riot = FakeRiot({"Good#NA1": {"puuid": "p1"}, "Other#NA1": status_error(403)})
+    with pytest.raises(httpx.HTTPStatusError):
+        batch(monkeypatch, riot, [("Good", "NA1"), ("Other", "NA1")])
+
+
+def test_duplicate_players_are_looked_up_once(monkeypatch):
+    riot = FakeRiot({
+        "Same#NA1": {"puuid": "p1", "gameName": "Same", "tagLine": "NA1"},
+        "same#na1": {"puuid": "p1", "gameName": "Same", "tagLine": "NA1"},
+    })
+    players = batch(monkeypatch, riot, [("Same", "NA1"), ("same", "na1")])
+
+    assert riot.id_requests == ["p1"]
+    assert [p["puuid"] for p in players] == ["p1", "p1"]
+
+
+@pytest.mark.parametrize("body", [
+    {"players": []},
+    {"players": [{"name": "a", "tag": "b"}] * 6},
+    {"players": [{"name": "", "tag": "b"}]},
+    {"players": [{"name": "a", "tag": "b"}], "count": 100},
+])
+def test_invalid_batches_are_rejected(body):
+    response = TestClient(index.app).post("/api/players/batch", json=body)
+    assert response.status_code == 422
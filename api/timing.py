@@ -0,0 +1,84 @@
+import asyncio
+import contextvars
+import cProfile
+import os
+import random
+import time
+from contextlib import contextmanager
+from config import PROFILE_SAMPLE_RATE, PROFILE_ADMIN_TOKEN, PROFILE_DIR
+
+# Timer for the request being served, copied into every task the request spawns
+current_timer = contextvars.ContextVar("current_timer", default=None)
+
+# cProfile can only have one active profiler per process
+_profile_active = False
+
+
+class RequestTimer:
+    def __init__(self):
+        # Span name -> duration in ms, in the order stages first finished
+        self.spans = {}
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def record(self, name, duration_ms):
+        # Concurrent spans with the same name keep the slowest, e.g. the slowest player lookup
+        self.spans[name] = round(max(self.spans.get(name, 0), duration_ms), 1)
+
+    def header(self):
+        return ", ".join(f"{name};dur={duration}" for name, duration in self.spans.items())
+
+
+@contextmanager
+def span(name):
+    # No-op outside of a timed request, so helpers can be called from scripts like replay.py
+    timer = current_timer.get()
+    if timer is None:
+        yield
+        return
+    with timer.span(name):
+        yield
+
+
+async def timed(name, awaitable):
+    with span(name):
+        return await awaitable
+
+
+def start_profile(request):
+    global _profile_active
+    if _profile_active:
+        return None
+    forced = PROFILE_ADMIN_TOKEN and request.headers.get("X-Profile-Token") == PROFILE_ADMIN_TOKEN
+    if not forced and random.random() >= PROFILE_SAMPLE_RATE:
+        return None
+    _profile_active = True
+    # Profiles the whole event loop thread while the request is in flight, other requests included
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def _dump_profile(profiler, file_path):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    profiler.dump_stats(file_path)
+
+
+async def stop_profile(profiler, request):
+    global _profile_active
+    profiler.disable()
+    _profile_active = False
+    slug = request.url.path.strip("/").replace("/", "_") or "root"
+    file_path = os.path.join(PROFILE_DIR, f"{slug}-{int(time.time() * 1000)}.prof")
+    # Writing to disk must neither block the event loop nor replace the real response or error
+    try:
+        await asyncio.to_thread(_dump_profile, profiler, file_path)
+        print(f"DEBUG: Profile saved to {file_path}")
+    except Exception as e:
+        print(f"ERROR: Could not save profile {file_path}: {e}")